@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 
-import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from kafka import KafkaConsumer
+import orjson
+from confluent_kafka import Consumer, KafkaException, Message, TopicPartition
+
+OUTPUT_BATCH_SIZE = 100
+MAX_POLL_RECORDS = 1000
+MAX_WORKERS = 16
+COMMIT_INTERVAL = 1000
+SEPARATOR = "-" * 50
+
+_EMPTY: dict[str, Any] = {}
 
 
 class MessageConsumer:
@@ -12,48 +22,101 @@ class MessageConsumer:
         broker: str = "localhost:29092",
         topic: str = "processed_events",
         group_id: str = "demo-consumer",
+        max_workers: int = MAX_WORKERS,
     ):
-        self.consumer = KafkaConsumer(
-            topic,
-            bootstrap_servers=[broker],
-            group_id=group_id,
-            value_deserializer=lambda m: json.loads(m.decode("utf-8")),
-            key_deserializer=lambda k: k.decode("utf-8") if k else None,
-            auto_offset_reset="latest",
-            enable_auto_commit=True,
-        )
+        self.consumer = Consumer({
+            "bootstrap.servers": broker,
+            "group.id": group_id,
+            "auto.offset.reset": "latest",
+            "enable.auto.commit": False,
+            "fetch.min.bytes": 1024 * 1024,
+            "fetch.wait.max.ms": 200,
+            "max.partition.fetch.bytes": 4 * 1024 * 1024,
+        })
+        self.consumer.subscribe([topic])
         self.topic = topic
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._offsets: dict[tuple[str, int], int] = {}
+        self._uncommitted = 0
 
     def consume(self, timeout_ms: int = 1000) -> None:
         print(f"Consuming from topic: {self.topic}")
-        print("Waiting for messages...\n")
+        print("Waiting for messages...\n", flush=True)
 
         try:
-            for message in self.consumer:
-                self._print_message(message.value)
+            while True:
+                messages = self.consumer.consume(num_messages=MAX_POLL_RECORDS, timeout=timeout_ms / 1000)
+                futures = []
+                for message in messages:
+                    if message.error():
+                        print(f"Consumer error: {message.error()}", file=sys.stderr)
+                        continue
+                    futures.append((message, self.pool.submit(self._handle, message.value())))
+
+                buffer = []
+                handled = []
+                for message, future in futures:
+                    buffer.append(future.result())
+                    handled.append(message)
+                    if len(buffer) >= OUTPUT_BATCH_SIZE:
+                        self._write(buffer, handled)
+                if buffer:
+                    self._write(buffer, handled)
         except KeyboardInterrupt:
             print("\nStopping consumer...")
         finally:
+            # Only offsets of messages whose output was written have been marked,
+            # so anything still buffered here is redelivered on the next run.
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self._commit()
             self.consumer.close()
 
-    def _print_message(self, envelope: dict[str, Any]) -> None:
-        print(f"Message ID: {envelope['id']}")
-        print(f"Source: {envelope['source']}")
-        print(f"Payload: {envelope['payload']}")
+    def _handle(self, value: bytes) -> str:
+        return self._format_message(orjson.loads(value))
 
-        metadata = envelope.get("metadata", {})
-        if filters_applied := metadata.get("filters_applied"):
-            rule_ids = filters_applied.get("rule_ids", [])
-            print(f"Applied rules: {rule_ids}")
+    def _mark_done(self, message: Message) -> None:
+        self._offsets[(message.topic(), message.partition())] = message.offset() + 1
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_INTERVAL:
+            self._commit()
 
-        if dedup := metadata.get("deduplication"):
-            is_unique = dedup.get("is_unique", False)
-            print(f"Deduplication: {'unique' if is_unique else 'duplicate'}")
+    def _commit(self) -> None:
+        if not self._offsets:
+            return
+        offsets = [TopicPartition(topic, partition, offset) for (topic, partition), offset in self._offsets.items()]
+        try:
+            self.consumer.commit(offsets=offsets, asynchronous=False)
+        except KafkaException as e:
+            print(f"Commit failed: {e}", file=sys.stderr)
+        self._offsets.clear()
+        self._uncommitted = 0
+
+    def _write(self, buffer: list[str], handled: list[Message]) -> None:
+        sys.stdout.write("".join(buffer))
+        sys.stdout.flush()
+        for message in handled:
+            self._mark_done(message)
+        buffer.clear()
+        handled.clear()
 
-        if enrichment := metadata.get("enrichment"):
-            print(f"Enrichment: {enrichment}")
+    def _format_message(self, envelope: dict[str, Any]) -> str:
+        metadata = envelope.get("metadata") or _EMPTY
+        filters_applied = metadata.get("filters_applied")
+        dedup = metadata.get("deduplication")
+        enrichment = metadata.get("enrichment")
 
-        print("-" * 50)
+        text = (
+            f"Message ID: {envelope['id']}\n"
+            f"Source: {envelope['source']}\n"
+            f"Payload: {envelope['payload']}\n"
+        )
+        if filters_applied:
+            text += f"Applied rules: {filters_applied.get('rule_ids', [])}\n"
+        if dedup:
+            text += f"Deduplication: {'unique' if dedup.get('is_unique', False) else 'duplicate'}\n"
+        if enrichment:
+            text += f"Enrichment: {enrichment}\n"
+        return f"{text}{SEPARATOR}\n"
 
 
 if __name__ == "__main__":
@@ -1,134 +1,194 @@
 #!/usr/bin/env python3
 
-import json
-import random
 import string
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from pathlib import Path
 
+import msgspec
+import numpy as np
+import orjson
 
-def generate_user_id() -> str:
-    return f"user-{random.randint(1, 9999)}"
 
+STATUSES = np.array(["completed", "active", "pending", "inactive", "processing"])
+TIERS = np.array(["basic", "premium", "enterprise"])
+CATEGORIES = np.array(["electronics", "clothing", "food", "books", "general"])
+DISCOUNT_TIERS = np.array([None, "standard", "gold", "premium"], dtype=object)
+SHIPPING_METHODS = np.array([None, "standard", "express", "premium"], dtype=object)
+LETTERS = np.frombuffer(string.ascii_lowercase.encode(), dtype="S1")
+LETTERS_AND_SPACE = np.frombuffer((string.ascii_lowercase + " ").encode(), dtype="S1")
+USER_IDS = np.array([f"user-{n}" for n in range(1, 10000)])
+ORDER_IDS = np.array([f"order-{n:03d}" for n in range(1, 10000)])
+MESSAGE_IDS = np.array([f"payment-order-{n:03d}" for n in range(1, 10000)])
 
-def generate_product_id() -> str:
-    letters = ''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 6)))
-    return f"product-{letters}"
+WRITE_BATCH_SIZE = 1000
 
+rng = np.random.default_rng()
 
-def generate_order_id() -> str:
-    return f"order-{random.randint(1, 9999):03d}"
 
+class Payload(msgspec.Struct, omit_defaults=True):
+    order_id: str
+    user_id: str
+    amount: float
+    currency: str
+    status: str
+    created_at: str
+    product_id: str | None = None
 
-def generate_message_id() -> str:
-    return f"payment-order-{random.randint(1, 9999):03d}"
 
+class Envelope(msgspec.Struct):
+    id: str
+    source: str
+    payload: Payload
 
-def generate_amount() -> float:
-    return round(random.uniform(10.0, 10000.0), 2)
 
+def generate_strings(count: int, min_length: int, max_length: int, alphabet: np.ndarray = LETTERS) -> list[str]:
+    lengths = rng.integers(min_length, max_length + 1, count).tolist()
+    chars = alphabet[rng.integers(0, len(alphabet), (count, max_length))].tobytes().decode("ascii")
+    return [chars[i * max_length:i * max_length + length] for i, length in enumerate(lengths)]
 
-def generate_status() -> str:
-    return random.choice(["completed", "active", "pending", "inactive", "processing"])
 
+def generate_user_ids(count: int) -> list[str]:
+    return rng.choice(USER_IDS, count).tolist()
 
-def generate_currency() -> str:
-    return "USD"
 
+def generate_product_ids(count: int) -> list[str]:
+    return [f"product-{letters}" for letters in generate_strings(count, 3, 6)]
 
-def generate_created_at() -> str:
-    base_date = datetime.now(timezone.utc)
 
-    days_offset = random.randint(-90, 90)
-    hours_offset = random.randint(0, 23)
-    minutes_offset = random.randint(0, 59)
-    dt = base_date + timedelta(days=days_offset, hours=hours_offset, minutes=minutes_offset)
-    return dt.isoformat().replace("+00:00", "Z")
+def generate_order_ids(count: int) -> list[str]:
+    return rng.choice(ORDER_IDS, count).tolist()
 
 
-def generate_payment_message() -> dict:
-    has_product = random.choice([True, False])
-    payload = {
-        "order_id": generate_order_id(),
-        "user_id": generate_user_id(),
-        "amount": generate_amount(),
-        "currency": generate_currency(),
-        "status": generate_status(),
-        "created_at": generate_created_at(),
-    }
-    if has_product:
-        payload["product_id"] = generate_product_id()
+def generate_message_ids(count: int) -> list[str]:
+    return rng.choice(MESSAGE_IDS, count).tolist()
 
-    return {
-        "id": generate_message_id(),
-        "source": "payment-service",
-        "payload": payload,
-    }
 
+def generate_amounts(count: int) -> list[float]:
+    return np.round(rng.uniform(10.0, 10000.0, count), 2).tolist()
 
-def generate_user_data(user_id: str) -> dict:
-    name_length = random.randint(5, 20)
-    name = ''.join(random.choices(string.ascii_lowercase + ' ', k=name_length)).title().strip()
-    email_prefix_length = random.randint(5, 10)
-    email_prefix = ''.join(random.choices(string.ascii_lowercase, k=email_prefix_length))
-    tier = random.choice(["basic", "premium", "enterprise"])
-
-    return {
-        "_id": user_id,
-        "name": name,
-        "email": f"{email_prefix}@example.com",
-        "tier": tier,
-    }
 
+def generate_statuses(count: int) -> list[str]:
+    return rng.choice(STATUSES, count).tolist()
 
-def generate_product_data(product_id: str) -> dict:
-    name_length = random.randint(5, 30)
-    name = ''.join(random.choices(string.ascii_lowercase + ' ', k=name_length)).title().strip()
-    price = round(random.uniform(10.0, 1000.0), 2)
-    category = random.choice(["electronics", "clothing", "food", "books", "general"])
 
-    return {
-        "_id": product_id,
-        "name": name,
-        "price": price,
-        "category": category,
-    }
+def generate_currency() -> str:
+    return "USD"
 
 
-def generate_order_data(order_id: str) -> dict:
-    discount_tier = random.choice([None, "standard", "gold", "premium"])
-    shipping_method = random.choice([None, "standard", "express", "premium"])
-    shipping_cost = round(random.uniform(0.0, 50.0), 2) if shipping_method == "express" else None
-    estimated_delivery = random.randint(1, 14)
+def generate_created_at(count: int) -> list[str]:
+    base_date = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
 
-    return {
-        "discount_tier": discount_tier,
-        "shipping_method": shipping_method,
-        "shipping_cost": shipping_cost,
-        "estimated_delivery_days": estimated_delivery,
-    }
+    days_offset = rng.integers(-90, 91, count)
+    hours_offset = rng.integers(0, 24, count)
+    minutes_offset = rng.integers(0, 60, count)
+    offsets = (days_offset * 1440 + hours_offset * 60 + minutes_offset).astype("timedelta64[m]")
+    return [f"{dt}Z" for dt in np.datetime_as_string(base_date + offsets, unit="us")]
 
 
-def generate_messages(count: int = 20) -> list[dict]:
-    messages = []
-    for _ in range(count):
-        messages.append(generate_payment_message())
-    return messages
+def generate_users(user_ids: list[str]) -> list[dict]:
+    count = len(user_ids)
+    columns = zip(
+        user_ids,
+        generate_strings(count, 5, 20, LETTERS_AND_SPACE),
+        generate_strings(count, 5, 10),
+        rng.choice(TIERS, count).tolist(),
+    )
 
+    return [
+        {
+            "_id": user_id,
+            "name": name.title().strip(),
+            "email": f"{email_prefix}@example.com",
+            "tier": tier,
+        }
+        for user_id, name, email_prefix, tier in columns
+    ]
+
+
+def generate_products(product_ids: list[str]) -> list[dict]:
+    count = len(product_ids)
+    columns = zip(
+        product_ids,
+        generate_strings(count, 5, 30, LETTERS_AND_SPACE),
+        np.round(rng.uniform(10.0, 1000.0, count), 2).tolist(),
+        rng.choice(CATEGORIES, count).tolist(),
+    )
+
+    return [
+        {
+            "_id": product_id,
+            "name": name.title().strip(),
+            "price": price,
+            "category": category,
+        }
+        for product_id, name, price, category in columns
+    ]
+
+
+def generate_orders(order_ids: list[str]) -> list[dict]:
+    count = len(order_ids)
+    shipping_methods = rng.choice(SHIPPING_METHODS, count)
+    shipping_costs = np.round(rng.uniform(0.0, 50.0, count), 2)
+    columns = zip(
+        rng.choice(DISCOUNT_TIERS, count).tolist(),
+        shipping_methods.tolist(),
+        np.where(shipping_methods == "express", shipping_costs, None).tolist(),
+        rng.integers(1, 15, count).tolist(),
+    )
+
+    return [
+        {
+            "discount_tier": discount_tier,
+            "shipping_method": shipping_method,
+            "shipping_cost": shipping_cost,
+            "estimated_delivery_days": estimated_delivery,
+        }
+        for discount_tier, shipping_method, shipping_cost, estimated_delivery in columns
+    ]
+
+
+def generate_messages(count: int = 20) -> tuple[list[Envelope], set[str], set[str], set[str]]:
+    order_ids = generate_order_ids(count)
+    user_ids = generate_user_ids(count)
+    columns = zip(
+        generate_message_ids(count),
+        order_ids,
+        user_ids,
+        generate_amounts(count),
+        generate_statuses(count),
+        generate_created_at(count),
+        generate_product_ids(count),
+        rng.integers(0, 2, count).astype(bool).tolist(),
+    )
+    currency = generate_currency()
 
-def generate_mongodb_data(messages: list[dict]) -> dict:
-    user_ids = set()
+    messages = []
     product_ids = set()
-
-    for msg in messages:
-        payload = msg["payload"]
-        if "user_id" in payload:
-            user_ids.add(payload["user_id"])
-        if "product_id" in payload:
-            product_ids.add(payload["product_id"])
-
-    users = [generate_user_data(uid) for uid in user_ids]
-    products = [generate_product_data(pid) for pid in product_ids]
+    for message_id, order_id, user_id, amount, status, created_at, product_id, has_product in columns:
+        if has_product:
+            product_ids.add(product_id)
+        else:
+            product_id = None
+
+        messages.append(Envelope(
+            id=message_id,
+            source="payment-service",
+            payload=Payload(
+                order_id=order_id,
+                user_id=user_id,
+                amount=amount,
+                currency=currency,
+                status=status,
+                created_at=created_at,
+                product_id=product_id,
+            ),
+        ))
+    return messages, set(user_ids), product_ids, set(order_ids)
+
+
+def generate_mongodb_data(user_ids: set[str], product_ids: set[str]) -> dict:
+    users = generate_users(list(user_ids))
+    products = generate_products(list(product_ids))
 
     return {
         "users": users,
@@ -136,18 +196,18 @@ def generate_mongodb_data(messages: list[dict]) -> dict:
     }
 
 
-def generate_redis_order_data(messages: list[dict]) -> dict:
-    order_ids = set()
-    for msg in messages:
-        payload = msg["payload"]
-        if "order_id" in payload:
-            order_ids.add(payload["order_id"])
+def generate_redis_order_data(order_ids: set[str]) -> dict:
+    ids = list(order_ids)
+    orders = generate_orders(ids)
+
+    return {f"order:{order_id}": order for order_id, order in zip(ids, orders)}
 
-    order_data = {}
-    for order_id in order_ids:
-        order_data[f"order:{order_id}"] = generate_order_data(order_id)
 
-    return order_data
+def write_jsonl(path: Path, records: list[msgspec.Struct]) -> None:
+    encoder = msgspec.json.Encoder()
+    with open(path, "wb") as f:
+        for i in range(0, len(records), WRITE_BATCH_SIZE):
+            f.write(encoder.encode_lines(records[i:i + WRITE_BATCH_SIZE]))
 
 
 def main():
@@ -155,17 +215,15 @@ def main():
     generated_dir.mkdir(exist_ok=True)
 
     print("Generating messages...")
-    messages = generate_messages(count=100_000)
-    messages_file = generated_dir / "messages.json"
-    with open(messages_file, "w") as f:
-        json.dump(messages, f, indent=2)
+    messages, user_ids, product_ids, order_ids = generate_messages(count=100_000)
+    messages_file = generated_dir / "messages.jsonl"
+    write_jsonl(messages_file, messages)
     print(f"Generated {len(messages)} messages -> {messages_file}")
 
     print("\nGenerating MongoDB data...")
-    mongodb_data = generate_mongodb_data(messages)
+    mongodb_data = generate_mongodb_data(user_ids, product_ids)
     mongodb_file = generated_dir / "mongodb_data.json"
-    with open(mongodb_file, "w") as f:
-        json.dump(mongodb_data, f, indent=2)
+    mongodb_file.write_bytes(orjson.dumps(mongodb_data))
     print(f"Generated {len(mongodb_data['users'])} users and {len(mongodb_data['products'])} products -> {mongodb_file}")
 
     print("\nGenerating Redis data...")
@@ -182,11 +240,10 @@ def main():
             "price": product["price"],
             "category": product["category"],
         }
-    order_redis_data = generate_redis_order_data(messages)
+    order_redis_data = generate_redis_order_data(order_ids)
     redis_data.update(order_redis_data)
     redis_file = generated_dir / "redis_data.json"
-    with open(redis_file, "w") as f:
-        json.dump(redis_data, f, indent=2)
+    redis_file.write_bytes(orjson.dumps(redis_data))
     print(f"Generated {len(redis_data)} Redis keys ({len(order_redis_data)} orders) -> {redis_file}")
 
     print("\nData generation completed!")
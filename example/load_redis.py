@@ -1,12 +1,28 @@
 #!/usr/bin/env python3
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import orjson
 import redis
 
+BATCH_SIZE = 1000
+WORKERS = 8
 
-def load_redis_data(redis_host: str = "localhost", redis_port: int = 6379, redis_db: int = 0):
+
+def load_shard(r: redis.Redis, items: list[tuple[str, object]]) -> int:
+    count = 0
+    pipe = r.pipeline(transaction=False)
+    for key, value in items:
+        pipe.set(key, orjson.dumps(value))
+        count += 1
+        if count % BATCH_SIZE == 0:
+            pipe.execute()
+    pipe.execute()
+    return count
+
+
+def load_redis_data(redis_host: str = "localhost", redis_port: int = 6379, redis_db: int = 0, workers: int = WORKERS):
     generated_dir = Path(__file__).parent / "generated"
     redis_file = generated_dir / "redis_data.json"
 
@@ -15,17 +31,15 @@ def load_redis_data(redis_host: str = "localhost", redis_port: int = 6379, redis
         print("   Run 'uv run generate_data.py' first to generate data.")
         return
 
-    with open(redis_file) as f:
-        data = json.load(f)
+    data = orjson.loads(redis_file.read_bytes())
 
-    r = redis.Redis(host=redis_host, port=redis_port, db=redis_db, decode_responses=False)
+    r = redis.Redis(host=redis_host, port=redis_port, db=redis_db, decode_responses=False, max_connections=workers)
 
     print(f"Loading data into Redis: {redis_host}:{redis_port}/{redis_db}")
 
-    count = 0
-    for key, value in data.items():
-        r.set(key, json.dumps(value))
-        count += 1
+    items = list(data.items())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        count = sum(pool.map(lambda shard: load_shard(r, items[shard::workers]), range(workers)))
 
     print(f"Loaded {count} keys into Redis")
 
@@ -1,42 +1,67 @@
 #!/usr/bin/env python3
 
 import json
+import sys
 import time
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
 import requests
-from kafka import KafkaProducer
+from requests.adapters import HTTPAdapter
+from confluent_kafka import Producer
+
+PROGRESS_INTERVAL = 1000
+FLUSH_INTERVAL = 10_000
 
 
 class RuleManager:
     def __init__(self, base_url: str = "http://localhost:8084"):
         self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._filter_cache: dict[str, dict] | None = None
+        self._enrichment_cache: dict[str, dict] | None = None
+        self._filter_names: dict[str, str] = {}
+        self._enrichment_names: dict[str, str] = {}
+
+    def _get_rules(self, kind: str) -> list[dict]:
+        url = f"{self.base_url}/api/v1/rules/{kind}"
+        response = self.session.get(url)
+        response.raise_for_status()
+        result = response.json()
+        return result if isinstance(result, list) else []
 
     def list_filtering_rules(self) -> list[dict]:
-        url = f"{self.base_url}/api/v1/rules/filtering"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            result = response.json()
-            return result if isinstance(result, list) else []
+            return self._get_rules("filtering")
         except requests.RequestException:
             return []
 
+    def _load_filters(self) -> dict[str, dict]:
+        if self._filter_cache is None:
+            try:
+                rules = self._get_rules("filtering")
+            except requests.RequestException:
+                return {}
+            self._filter_cache = {rule["name"]: rule for rule in rules if "name" in rule}
+            self._filter_names = {rule["id"]: name for name, rule in self._filter_cache.items() if "id" in rule}
+        return self._filter_cache
+
     def get_filtering_rule_by_name(self, name: str) -> dict | None:
-        rules = self.list_filtering_rules()
-        if not rules:
-            return None
-        for rule in rules:
-            if rule.get("name") == name:
-                return rule
-        return None
+        return self._load_filters().get(name)
 
     def delete_filtering_rule(self, rule_id: str) -> None:
         url = f"{self.base_url}/api/v1/rules/filtering/{rule_id}"
-        response = requests.delete(url)
+        response = self.session.delete(url)
         response.raise_for_status()
+        name = self._filter_names.pop(rule_id, None)
+        if self._filter_cache is not None and name is not None:
+            self._filter_cache.pop(name, None)
 
     def create_filtering_rule(self, name: str, expression: str, priority: int = 10) -> str:
         existing = self.get_filtering_rule_by_name(name)
@@ -50,39 +75,48 @@ class RuleManager:
             "priority": priority,
             "enabled": True,
         }
-        response = requests.post(url, json=payload)
+        response = self.session.post(url, json=payload)
         response.raise_for_status()
-        return response.json()["id"]
+        created = response.json()
+        self._load_filters()[name] = created
+        self._filter_names[created["id"]] = name
+        return created["id"]
 
     def update_filtering_rule(self, rule_id: str, expression: str) -> None:
         url = f"{self.base_url}/api/v1/rules/filtering/{rule_id}"
         payload = {"expression": expression}
-        response = requests.put(url, json=payload)
+        response = self.session.put(url, json=payload)
         response.raise_for_status()
+        name = self._filter_names.get(rule_id)
+        if self._filter_cache is not None and name in self._filter_cache:
+            self._filter_cache[name]["expression"] = expression
 
     def list_enrichment_rules(self) -> list[dict]:
-        url = f"{self.base_url}/api/v1/rules/enrichment"
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            result = response.json()
-            return result if isinstance(result, list) else []
+            return self._get_rules("enrichment")
         except requests.RequestException:
             return []
 
+    def _load_enrichment_rules(self) -> dict[str, dict]:
+        if self._enrichment_cache is None:
+            try:
+                rules = self._get_rules("enrichment")
+            except requests.RequestException:
+                return {}
+            self._enrichment_cache = {rule["name"]: rule for rule in rules if "name" in rule}
+            self._enrichment_names = {rule["id"]: name for name, rule in self._enrichment_cache.items() if "id" in rule}
+        return self._enrichment_cache
+
     def get_enrichment_rule_by_name(self, name: str) -> dict | None:
-        rules = self.list_enrichment_rules()
-        if not rules:
-            return None
-        for rule in rules:
-            if rule.get("name") == name:
-                return rule
-        return None
+        return self._load_enrichment_rules().get(name)
 
     def delete_enrichment_rule(self, rule_id: str) -> None:
         url = f"{self.base_url}/api/v1/rules/enrichment/{rule_id}"
-        response = requests.delete(url)
+        response = self.session.delete(url)
         response.raise_for_status()
+        name = self._enrichment_names.pop(rule_id, None)
+        if self._enrichment_cache is not None and name is not None:
+            self._enrichment_cache.pop(name, None)
 
     def create_enrichment_rule(self, rule: dict[str, Any]) -> str:
         existing = self.get_enrichment_rule_by_name(rule["name"])
@@ -101,7 +135,7 @@ class RuleManager:
             "priority": rule.get("priority", 10),
             "enabled": rule.get("enabled", True),
         }
-        response = requests.post(url, json=payload)
+        response = self.session.post(url, json=payload)
         if not response.ok:
             print(f"Error creating rule '{rule['name']}': {response.status_code}")
             try:
@@ -117,7 +151,10 @@ class RuleManager:
                 print(f"  Failed to parse JSON: {e}")
             print(f"  Payload sent: {json.dumps(payload, indent=2)}")
             response.raise_for_status()
-        return response.json()["id"]
+        created = response.json()
+        self._load_enrichment_rules()[rule["name"]] = created
+        self._enrichment_names[created["id"]] = rule["name"]
+        return created["id"]
 
     def update_deduplication_config(self, config: dict[str, Any]) -> None:
         url = f"{self.base_url}/api/v1/config/deduplication"
@@ -127,32 +164,63 @@ class RuleManager:
             "on_redis_error": config.get("on_redis_error"),
             "fields_to_hash": config.get("fields_to_hash", []),
         }
-        response = requests.put(url, json=payload)
+        response = self.session.put(url, json=payload)
         response.raise_for_status()
 
+    def close(self) -> None:
+        self.session.close()
+
 
 class MessageProducer:
     def __init__(self, broker: str = "localhost:29092", topic: str = "input_events"):
-        self.producer = KafkaProducer(
-            bootstrap_servers=[broker],
-            value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-            key_serializer=lambda k: k.encode("utf-8") if k else None,
-        )
+        self.producer = Producer({
+            "bootstrap.servers": broker,
+            "acks": 1,
+            "linger.ms": 10,
+            "compression.type": "lz4",
+        })
         self.topic = topic
+        self.failed = 0
 
     def send_envelope(self, envelope: dict[str, Any]) -> None:
         if "timestamp" not in envelope:
             envelope["timestamp"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         if "metadata" not in envelope:
             envelope["metadata"] = {}
-        self.producer.send(self.topic, key=envelope["id"], value=envelope)
-        self.producer.flush()
+        value = orjson.dumps(envelope)
+        try:
+            self.producer.produce(self.topic, key=envelope["id"], value=value, on_delivery=self._on_delivery)
+        except BufferError:
+            # Local queue is full: wait for in-flight deliveries, then retry once.
+            self.producer.poll(1)
+            self.producer.produce(self.topic, key=envelope["id"], value=value, on_delivery=self._on_delivery)
+        self.producer.poll(0)
+
+    def _on_delivery(self, err, msg) -> None:
+        if err is not None:
+            self.failed += 1
+            print(f"Delivery failed for {msg.key()}: {err}", file=sys.stderr)
+
+    def flush(self) -> None:
+        remaining = self.producer.flush()
+        if remaining:
+            print(f"{remaining} messages still awaiting delivery after flush", file=sys.stderr)
 
     def close(self) -> None:
-        self.producer.close()
+        self.flush()
+
 
+def iter_messages(path: Path) -> Iterator[dict]:
+    if path.suffix != ".jsonl":
+        yield from orjson.loads(path.read_bytes())
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
 
-def load_fixtures() -> tuple[list[dict], list[dict], dict, list[dict]]:
+
+def load_fixtures() -> tuple[list[dict], list[dict], dict, Iterator[dict]]:
     fixtures_dir = Path(__file__).parent / "fixtures"
     generated_dir = Path(__file__).parent / "generated"
 
@@ -163,13 +231,14 @@ def load_fixtures() -> tuple[list[dict], list[dict], dict, list[dict]]:
     with open(fixtures_dir / "deduplication.json") as f:
         dedup_config = json.load(f)
 
-    messages_file = generated_dir / "messages.json"
-    if messages_file.exists():
-        with open(messages_file) as f:
-            messages = json.load(f)
-    else:
-        with open(fixtures_dir / "messages.json") as f:
-            messages = json.load(f)
+    generated_file = generated_dir / "messages.jsonl"
+    candidates = [generated_file, fixtures_dir / "messages.json"]
+    messages_file = next((path for path in candidates if path.exists()), None)
+    if messages_file is None:
+        raise FileNotFoundError(
+            f"Messages file not found: {generated_file}. Run 'uv run generate_data.py' first to generate data."
+        )
+    messages = iter_messages(messages_file)
 
     return filtering_rules, enrichment_rules, dedup_config, messages
 
@@ -199,19 +268,26 @@ def main():
     print("\n=== Setting up deduplication config ===")
     rule_manager.update_deduplication_config(dedup_config)
     print(f"  Configured: hash={dedup_config['hash_algorithm']}, TTL={dedup_config['ttl_seconds']}s")
+    rule_manager.close()
 
     print("\n=== Waiting for rules to propagate ===")
     time.sleep(5)
 
     print("\n=== Sending payment-service messages ===")
-    print(f"Sending {len(messages)} generated messages...")
-    for i, msg in enumerate(messages, 1):
+    print("Sending generated messages...")
+    sent = 0
+    for msg in messages:
         message_producer.send_envelope(msg)
-        payload = msg["payload"]
-        product_info = f", product_id: {payload.get('product_id')}" if payload.get("product_id") else ""
-        print(f"  [{i}/{len(messages)}] Sent: {msg['id']} (order_id: {payload['order_id']}, amount: {payload['amount']}, status: {payload['status']}{product_info})")
+        sent += 1
+        if sent % FLUSH_INTERVAL == 0:
+            message_producer.flush()
+        if sent % PROGRESS_INTERVAL == 0:
+            print(f"  [{sent}] sent")
 
     message_producer.close()
+    if message_producer.failed:
+        print(f"  Failed to deliver {message_producer.failed} messages")
+    print(f"  Sent {sent} messages")
     print("\n=== Demo completed ===")
     print("Check consumer output for processed messages.")
 